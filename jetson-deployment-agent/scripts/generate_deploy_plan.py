@@ -5,10 +5,16 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib encoder.
+    orjson = None
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate Jetson deployment plan JSON.")
@@ -30,9 +36,22 @@ def parse_args() -> argparse.Namespace:
 
 
 def load_json(path: str) -> dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
     return json.loads(Path(path).read_text(encoding="utf-8"))
 
 
+def write_json(path: Path, payload: dict[str, Any]) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2) + b"\n")
+    else:
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+            handle.write("\n")
+    os.replace(tmp_path, path)
+
+
 def build_preflight_step(step_id: str) -> dict[str, Any]:
     return {
         "id": step_id,
@@ -62,10 +81,6 @@ def main() -> int:
     steps: list[dict[str, Any]] = []
     manual_prerequisites: list[dict[str, Any]] = []
 
-    step_counter = 1
-    steps.append(build_preflight_step(f"step-{step_counter:03d}"))
-    step_counter += 1
-
     actions = analysis.get("recommended_actions", [])
     if not isinstance(actions, list):
         actions = []
@@ -97,10 +112,12 @@ def main() -> int:
                 }
             ]
 
-    for raw_action in actions:
+    step_ids = [f"step-{index:03d}" for index in range(1, len(actions) + 2)]
+    steps.append(build_preflight_step(step_ids[0]))
+
+    for step_id, raw_action in zip(step_ids[1:], actions):
         action = ensure_step_shape(raw_action)
-        action["id"] = f"step-{step_counter:03d}"
-        step_counter += 1
+        action["id"] = step_id
 
         if args.allow_sudo == "no" and action["requires_sudo"]:
             manual_prerequisites.append(
@@ -134,7 +151,7 @@ def main() -> int:
 
     output = Path(args.output)
     output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    write_json(output, payload)
     return 0
 
 
@@ -5,10 +5,58 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
+from functools import lru_cache
+from itertools import zip_longest
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib encoder.
+    orjson = None
+
+KNOWN_MODELS = (
+    "jetson nano",
+    "jetson xavier nx",
+    "jetson agx xavier",
+    "jetson orin nano",
+    "jetson orin nx",
+    "jetson agx orin",
+    "jetson tx2",
+)
+
+COMPONENT_ALIASES = {
+    "torch": "pytorch",
+}
+
+MAJOR_TO_SERIES = {"5": "5.x", "6": "6.x"}
+L4T_TO_SERIES = {"R35": "5.x", "R36": "6.x"}
+
+PLACEHOLDER_ROLLBACK_HINT = "No state changed by this placeholder action."
+MANUAL_ACTION_COMMAND = "echo \"Manual action required: {}\""
+IMPORT_VERSION_CHECK = (
+    "python3 - <<'PY'\n"
+    "import importlib\n"
+    "m=importlib.import_module('{}')\n"
+    "print(getattr(m, '__version__', 'unknown'))\n"
+    "PY"
+)
+
+_DIGITS_RE = re.compile(r"\d+")
+_UBUNTU_RE = re.compile(r"\b(\d{2}\.\d{2})\b")
+_MODEL_RE = re.compile("|".join(re.escape(m) for m in sorted(KNOWN_MODELS, key=len, reverse=True)))
+_SIMPLE_VERSION_CHARS = frozenset("0123456789.")
+_OP_TABLE = {
+    "==": lambda cmp_value: cmp_value == 0,
+    ">=": lambda cmp_value: cmp_value >= 0,
+    "<=": lambda cmp_value: cmp_value <= 0,
+    ">": lambda cmp_value: cmp_value > 0,
+    "<": lambda cmp_value: cmp_value < 0,
+    "~=": lambda cmp_value: cmp_value >= 0,
+}
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Analyze Jetson compatibility.")
@@ -20,42 +68,50 @@ def parse_args() -> argparse.Namespace:
 
 
 def load_json(path: str) -> dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
     return json.loads(Path(path).read_text(encoding="utf-8"))
 
 
+def write_json(path: Path, payload: dict[str, Any]) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2) + b"\n")
+    else:
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+            handle.write("\n")
+    os.replace(tmp_path, path)
+
+
+@lru_cache(maxsize=1024)
 def version_tuple(version: str) -> tuple[int, ...]:
-    nums = [int(x) for x in re.findall(r"\d+", version)]
-    return tuple(nums) if nums else (0,)
+    # Fast path for plain dotted versions such as "5.1.2" or "36".
+    stripped = version.strip()
+    if (
+        stripped
+        and _SIMPLE_VERSION_CHARS.issuperset(stripped)
+        and ".." not in stripped
+        and not stripped.startswith(".")
+        and not stripped.endswith(".")
+    ):
+        return tuple(map(int, stripped.split(".")))
+    nums = _DIGITS_RE.findall(version)
+    return tuple(map(int, nums)) if nums else (0,)
 
 
 def compare_versions(left: str, right: str) -> int:
-    a = list(version_tuple(left))
-    b = list(version_tuple(right))
-    size = max(len(a), len(b))
-    a.extend([0] * (size - len(a)))
-    b.extend([0] * (size - len(b)))
-    if a < b:
-        return -1
-    if a > b:
-        return 1
+    for a, b in zip_longest(version_tuple(left), version_tuple(right), fillvalue=0):
+        if a != b:
+            return -1 if a < b else 1
     return 0
 
 
 def satisfies(installed: str, operator: str, required: str) -> bool:
-    cmp_value = compare_versions(installed, required)
-    if operator == "==":
-        return cmp_value == 0
-    if operator == ">=":
-        return cmp_value >= 0
-    if operator == "<=":
-        return cmp_value <= 0
-    if operator == ">":
-        return cmp_value > 0
-    if operator == "<":
-        return cmp_value < 0
-    if operator == "~=":
-        return cmp_value >= 0
-    return False
+    check = _OP_TABLE.get(operator)
+    if check is None:
+        return False
+    return check(compare_versions(installed, required))
 
 
 def infer_jetpack_series(facts: dict[str, Any]) -> str:
@@ -64,89 +120,71 @@ def infer_jetpack_series(facts: dict[str, Any]) -> str:
         return series
 
     jp_version = str(facts.get("jetpack", {}).get("installed_version", ""))
-    if jp_version.startswith("5"):
-        return "5.x"
-    if jp_version.startswith("6"):
-        return "6.x"
+    series = MAJOR_TO_SERIES.get(jp_version[:1])
+    if series:
+        return series
 
     l4t_release = str(facts.get("l4t", {}).get("release", ""))
-    if l4t_release.startswith("R35"):
-        return "5.x"
-    if l4t_release.startswith("R36"):
-        return "6.x"
-    return "unknown"
+    return L4T_TO_SERIES.get(l4t_release[:3], "unknown")
 
 
+@lru_cache(maxsize=256)
 def major_to_series(version: str) -> str:
-    if version.lower().endswith(".x"):
-        major = version.split(".", 1)[0]
-    else:
-        major = version.split(".", 1)[0]
-    if major == "5":
-        return "5.x"
-    if major == "6":
-        return "6.x"
-    return "unknown"
+    return MAJOR_TO_SERIES.get(version.split(".", 1)[0], "unknown")
 
 
 def find_ubuntu_version(facts: dict[str, Any]) -> str:
     pretty = str(facts.get("os", {}).get("pretty_name", ""))
-    match = re.search(r"\b(\d{2}\.\d{2})\b", pretty)
+    match = _UBUNTU_RE.search(pretty)
     return match.group(1) if match else "unknown"
 
 
-def get_installed_component_version(component: str, facts: dict[str, Any]) -> str:
-    if component == "jetpack":
-        return str(facts.get("jetpack", {}).get("installed_version", "unknown"))
-    if component == "cuda":
-        return str(facts.get("cuda", {}).get("version", "unknown"))
-    if component == "python":
-        return str(facts.get("python", {}).get("version", "unknown"))
-    if component == "ubuntu":
-        return find_ubuntu_version(facts)
-    if component == "tensorrt":
-        value = str(facts.get("tensorrt", {}).get("version", "unknown"))
-        return value
-    return "unknown"
+_VERSION_EXTRACTORS = {
+    "jetpack": lambda facts: str(facts.get("jetpack", {}).get("installed_version", "unknown")),
+    "cuda": lambda facts: str(facts.get("cuda", {}).get("version", "unknown")),
+    "python": lambda facts: str(facts.get("python", {}).get("version", "unknown")),
+    "ubuntu": find_ubuntu_version,
+    "tensorrt": lambda facts: str(facts.get("tensorrt", {}).get("version", "unknown")),
+    "l4t": lambda facts: str(facts.get("l4t", {}).get("release", "unknown")),
+}
+
 
+def collect_installed_versions(facts: dict[str, Any]) -> dict[str, str]:
+    return {component: extractor(facts) for component, extractor in _VERSION_EXTRACTORS.items()}
 
-def pick_supported_version(matrix: dict[str, Any], component: str, series: str) -> str:
-    supported = matrix.get("component_support", {}).get(component, {}).get(series, [])
+
+def pick_supported_version(support_map: dict[str, Any], component: str, series: str) -> str:
+    supported = support_map.get(component, {}).get(series, [])
     if not supported:
         return ""
-    return str(supported[-1])
+    return supported[-1]
 
 
 def detect_required_models(hardware_requirements: list[str]) -> list[str]:
-    known_models = [
-        "jetson nano",
-        "jetson xavier nx",
-        "jetson agx xavier",
-        "jetson orin nano",
-        "jetson orin nx",
-        "jetson agx orin",
-        "jetson tx2",
-    ]
     found: list[str] = []
     for line in hardware_requirements:
-        lowered = line.lower()
-        for model in known_models:
-            if model in lowered and model not in found:
+        hits = set(_MODEL_RE.findall(line.lower()))
+        if not hits:
+            continue
+        for model in KNOWN_MODELS:
+            if model in hits and model not in found:
                 found.append(model)
     return found
 
 
-def component_range(matrix: dict[str, Any], series: str, component: str) -> tuple[str, str]:
-    series_info = matrix.get("jetpack_series", {}).get(series, {})
-    entry = series_info.get(component, {})
-    return str(entry.get("min", "")), str(entry.get("max", ""))
+def component_range(series_info: dict[str, Any], component: str) -> tuple[str, str]:
+    entry = series_info.get(component)
+    if not isinstance(entry, dict):
+        return "", ""
+    return entry.get("min") or "", entry.get("max") or ""
 
 
+@lru_cache(maxsize=256)
 def normalize_component(raw: str) -> str:
-    lowered = raw.lower().replace(" ", "")
-    if lowered in {"onnxruntime", "onnxruntime"}:
-        return "onnxruntime"
-    return lowered
+    lowered = raw.strip().lower()
+    if " " in lowered or "-" in lowered or "_" in lowered:
+        lowered = lowered.replace(" ", "").replace("-", "").replace("_", "")
+    return COMPONENT_ALIASES.get(lowered, lowered)
 
 
 def add_issue(issues: list[dict[str, Any]], **kwargs: Any) -> None:
@@ -157,18 +195,12 @@ def add_blocker(blocked: list[dict[str, Any]], **kwargs: Any) -> None:
     blocked.append(kwargs)
 
 
-def unique_strings(items: list[str]) -> list[str]:
-    seen: set[str] = set()
-    result: list[str] = []
-    for item in items:
-        if item not in seen:
-            seen.add(item)
-            result.append(item)
-    return result
+def add_alternative(alternatives: dict[str, None], text: str) -> None:
+    if text:
+        alternatives[text] = None
 
 
 def make_action(
-    action_id: str,
     summary: str,
     command: str,
     requires_sudo: bool,
@@ -177,7 +209,7 @@ def make_action(
     verify_command: str,
 ) -> dict[str, Any]:
     return {
-        "id": action_id,
+        "id": "",
         "summary": summary,
         "command": command,
         "requires_sudo": requires_sudo,
@@ -195,13 +227,14 @@ def main() -> int:
 
     facts_series = infer_jetpack_series(facts)
     facts_model = str(facts.get("device", {}).get("model", "unknown"))
+    installed_versions = collect_installed_versions(facts)
 
     issues: list[dict[str, Any]] = []
     blocked_items: list[dict[str, Any]] = []
     ready_items: list[dict[str, Any]] = []
-    alternatives: list[str] = []
+    alternatives: dict[str, None] = {}
     recommended_actions: list[dict[str, Any]] = []
-    action_index = 1
+    blocked_components: set[str] = set()
 
     required_models = detect_required_models(requirements.get("hardware_requirements", []))
     if required_models:
@@ -214,7 +247,7 @@ def main() -> int:
                 required=required_models,
                 installed=facts_model,
             )
-            alternatives.append("Use a tutorial that targets the current Jetson model, or switch hardware.")
+            add_alternative(alternatives, "Use a tutorial that targets the current Jetson model, or switch hardware.")
         else:
             ready_items.append(
                 {
@@ -224,20 +257,26 @@ def main() -> int:
                 }
             )
 
+    series_info = matrix.get("jetpack_series", {}).get(facts_series, {})
+    support_map = matrix.get("component_support", {})
+    alternatives_map = matrix.get("alternatives", {})
+
     constraints = requirements.get("version_constraints", [])
     for raw_constraint in constraints:
         component = normalize_component(str(raw_constraint.get("component", "")))
+        if component in blocked_components:
+            continue
         operator = str(raw_constraint.get("operator", "=="))
         required_version = str(raw_constraint.get("version", ""))
         evidence = str(raw_constraint.get("evidence", ""))
-        installed_version = get_installed_component_version(component, facts)
+        installed_version = installed_versions.get(component, "unknown")
 
         if component == "l4t":
             ready_items.append(
                 {
                     "component": "l4t",
                     "required": f"{operator} {required_version}",
-                    "installed": str(facts.get("l4t", {}).get("release", "unknown")),
+                    "installed": installed_version,
                 }
             )
             continue
@@ -256,19 +295,18 @@ def main() -> int:
                         installed=installed_version,
                         evidence=evidence,
                     )
-                    alternatives.append(matrix.get("alternatives", {}).get("jetpack_major_mismatch", "Use a compatible tutorial or reflash to matching major."))
+                    blocked_components.add(component)
+                    add_alternative(alternatives, alternatives_map.get("jetpack_major_mismatch", "Use a compatible tutorial or reflash to matching major."))
                     recommended_actions.append(
                         make_action(
-                            action_id=f"action-{action_index:03d}",
                             summary="Handle JetPack major mismatch manually.",
-                            command="echo \"Manual action required: major JetPack mismatch detected. Review fallback or reflash path.\"",
+                            command=MANUAL_ACTION_COMMAND.format("major JetPack mismatch detected. Review fallback or reflash path."),
                             requires_sudo=False,
                             risk_level="high",
-                            rollback_hint="No state changed by this placeholder action.",
+                            rollback_hint=PLACEHOLDER_ROLLBACK_HINT,
                             verify_command="echo \"Verify major compatibility decision is documented.\"",
                         )
                     )
-                    action_index += 1
                     continue
                 if operator == ">=" and compare_versions(facts_major.split(".")[0], required_series.split(".")[0]) < 0:
                     add_blocker(
@@ -279,19 +317,18 @@ def main() -> int:
                         installed=installed_version,
                         evidence=evidence,
                     )
-                    alternatives.append(matrix.get("alternatives", {}).get("jetpack_major_mismatch", "Use a compatible tutorial or reflash to matching major."))
+                    blocked_components.add(component)
+                    add_alternative(alternatives, alternatives_map.get("jetpack_major_mismatch", "Use a compatible tutorial or reflash to matching major."))
                     recommended_actions.append(
                         make_action(
-                            action_id=f"action-{action_index:03d}",
                             summary="Escalate JetPack major upgrade decision.",
                             command="echo \"Manual decision required: tutorial needs newer JetPack major.\"",
                             requires_sudo=False,
                             risk_level="high",
-                            rollback_hint="No state changed by this placeholder action.",
+                            rollback_hint=PLACEHOLDER_ROLLBACK_HINT,
                             verify_command="echo \"Verify upgrade or fallback decision is approved.\"",
                         )
                     )
-                    action_index += 1
                     continue
 
             ready_items.append(
@@ -314,10 +351,10 @@ def main() -> int:
                     installed=installed_version,
                     evidence=evidence,
                 )
-                alternatives.append(f"Collect {component} facts again and re-run compatibility analysis.")
+                add_alternative(alternatives, f"Collect {component} facts again and re-run compatibility analysis.")
                 continue
 
-            min_v, max_v = component_range(matrix, facts_series, component)
+            min_v, max_v = component_range(series_info, component)
             if max_v and compare_versions(required_version, max_v) > 0 and operator in {"==", ">=", ">"}:
                 add_blocker(
                     blocked_items,
@@ -327,19 +364,18 @@ def main() -> int:
                     installed=installed_version,
                     evidence=evidence,
                 )
-                alternatives.append(f"Use a {component} version within {facts_series} supported range ({min_v} to {max_v}).")
+                blocked_components.add(component)
+                add_alternative(alternatives, f"Use a {component} version within {facts_series} supported range ({min_v} to {max_v}).")
                 recommended_actions.append(
                     make_action(
-                        action_id=f"action-{action_index:03d}",
                         summary=f"Resolve unsupported {component} requirement.",
-                        command=f"echo \"Manual action required: adjust {component} requirement to {facts_series} supported range.\"",
+                        command=MANUAL_ACTION_COMMAND.format(f"adjust {component} requirement to {facts_series} supported range."),
                         requires_sudo=True,
                         risk_level="high",
-                        rollback_hint="No state changed by this placeholder action.",
+                        rollback_hint=PLACEHOLDER_ROLLBACK_HINT,
                         verify_command=f"echo \"Verify {component} requirement now fits {facts_series} range.\"",
                     )
                 )
-                action_index += 1
                 continue
 
             if satisfies(installed_version, operator, required_version):
@@ -369,7 +405,7 @@ def main() -> int:
                     requires_sudo = True
                 if component == "ubuntu":
                     suggestion = "Do not force unsupported Ubuntu version changes inside an existing JetPack image."
-                    command = "echo \"Manual action required: Ubuntu baseline mismatch with tutorial.\""
+                    command = MANUAL_ACTION_COMMAND.format("Ubuntu baseline mismatch with tutorial.")
                     risk_level = "high"
                     requires_sudo = True
 
@@ -383,10 +419,9 @@ def main() -> int:
                     suggestion=suggestion,
                     evidence=evidence,
                 )
-                alternatives.append(suggestion or f"Adjust {component} requirement to match installed JetPack series.")
+                add_alternative(alternatives, suggestion or f"Adjust {component} requirement to match installed JetPack series.")
                 recommended_actions.append(
                     make_action(
-                        action_id=f"action-{action_index:03d}",
                         summary=f"Adjust {component} compatibility.",
                         command=command,
                         requires_sudo=requires_sudo,
@@ -395,11 +430,10 @@ def main() -> int:
                         verify_command=verify_command,
                     )
                 )
-                action_index += 1
             continue
 
         if component in {"pytorch", "onnxruntime"}:
-            supported = matrix.get("component_support", {}).get(component, {}).get(facts_series, [])
+            supported = support_map.get(component, {}).get(facts_series, [])
             if not supported:
                 add_issue(
                     issues,
@@ -410,11 +444,15 @@ def main() -> int:
                     installed="unknown",
                     evidence=evidence,
                 )
-                alternatives.append(f"Manually validate {component} package availability for {facts_series}.")
+                add_alternative(alternatives, f"Manually validate {component} package availability for {facts_series}.")
                 continue
 
-            required_prefix = ".".join(required_version.split(".")[:2]) if "." in required_version else required_version
-            supported_ok = any(required_prefix == s or required_version.startswith(s) for s in supported)
+            major, sep, rest = required_version.partition(".")
+            required_prefix = f"{major}.{rest.partition('.')[0]}" if sep else required_version
+            if required_prefix in set(supported):
+                supported_ok = True
+            else:
+                supported_ok = any(required_version.startswith(s) for s in supported)
 
             if supported_ok:
                 ready_items.append(
@@ -425,7 +463,7 @@ def main() -> int:
                     }
                 )
             else:
-                alternative = pick_supported_version(matrix, component, facts_series)
+                alternative = pick_supported_version(support_map, component, facts_series)
                 suggestion = (
                     f"Pin {component} to {alternative} for {facts_series}."
                     if alternative
@@ -441,7 +479,7 @@ def main() -> int:
                     suggestion=suggestion,
                     evidence=evidence,
                 )
-                alternatives.append(suggestion)
+                add_alternative(alternatives, suggestion)
                 install_cmd = (
                     f"python3 -m pip install {component}=={alternative}"
                     if alternative
@@ -449,21 +487,19 @@ def main() -> int:
                 )
                 recommended_actions.append(
                     make_action(
-                        action_id=f"action-{action_index:03d}",
                         summary=f"Pin {component} to a {facts_series} compatible version.",
                         command=install_cmd,
                         requires_sudo=False,
                         risk_level="medium",
                         rollback_hint=f"Reinstall previous {component} version if regression is observed.",
-                        verify_command=f"python3 - <<'PY'\nimport importlib\nm=importlib.import_module('{component}')\nprint(getattr(m, '__version__', 'unknown'))\nPY",
+                        verify_command=IMPORT_VERSION_CHECK.format(component),
                     )
                 )
-                action_index += 1
             continue
 
         if component == "tensorrt":
             required_major = required_version.split(".", 1)[0]
-            expected_major = str(matrix.get("jetpack_series", {}).get(facts_series, {}).get("tensorrt_major", ""))
+            expected_major = str(series_info.get("tensorrt_major", ""))
             if expected_major and required_major != expected_major:
                 add_blocker(
                     blocked_items,
@@ -473,19 +509,18 @@ def main() -> int:
                     installed=f"expected major {expected_major}",
                     evidence=evidence,
                 )
-                alternatives.append(f"Use TensorRT major {expected_major} for {facts_series}.")
+                blocked_components.add(component)
+                add_alternative(alternatives, f"Use TensorRT major {expected_major} for {facts_series}.")
                 recommended_actions.append(
                     make_action(
-                        action_id=f"action-{action_index:03d}",
                         summary="Resolve TensorRT major mismatch.",
                         command=f"echo \"Use TensorRT major {expected_major} to match {facts_series}.\"",
                         requires_sudo=True,
                         risk_level="high",
-                        rollback_hint="No state changed by this placeholder action.",
+                        rollback_hint=PLACEHOLDER_ROLLBACK_HINT,
                         verify_command="echo \"Verify TensorRT major compatibility.\"",
                     )
                 )
-                action_index += 1
             else:
                 ready_items.append(
                     {
@@ -505,9 +540,10 @@ def main() -> int:
             installed="unknown",
             evidence=evidence,
         )
-        alternatives.append(f"Manually map unknown component '{component}' to Jetson-compatible packages.")
+        add_alternative(alternatives, f"Manually map unknown component '{component}' to Jetson-compatible packages.")
 
-    alternatives = unique_strings([x for x in alternatives if x])
+    for index, action in enumerate(recommended_actions, start=1):
+        action["id"] = f"action-{index:03d}"
 
     if blocked_items:
         overall_status = "blocked"
@@ -520,7 +556,7 @@ def main() -> int:
         "overall_status": overall_status,
         "facts_series": facts_series,
         "issues": issues,
-        "alternatives": alternatives,
+        "alternatives": list(alternatives),
         "blocked_items": blocked_items,
         "ready_items": ready_items,
         "recommended_actions": recommended_actions,
@@ -528,7 +564,7 @@ def main() -> int:
 
     output = Path(args.output)
     output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    write_json(output, payload)
     return 0
 
 
@@ -4,45 +4,77 @@
 from __future__ import annotations
 
 import argparse
+import codecs
 import json
+import os
 import re
 import sys
-from dataclasses import dataclass
+from functools import lru_cache
 from html.parser import HTMLParser
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from typing import Iterable
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, NamedTuple
 from urllib.parse import unquote, urlparse
 from urllib.request import Request, urlopen
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib encoder.
+    orjson = None
+
+READ_CHUNK_SIZE = 64 * 1024
+HTML_SNIFF_CHARS = 4096
+HTML_SNIFF_RE = re.compile(r"<html", re.IGNORECASE)
+
+IGNORED_TAGS = frozenset({"script", "style"})
+BLOCK_TAGS = frozenset({"p", "li", "h1", "h2", "h3", "h4", "h5", "h6", "br", "tr"})
+
 
 class PlainTextHTMLParser(HTMLParser):
     def __init__(self) -> None:
         super().__init__()
-        self._parts: list[str] = []
+        self._current: list[str] = []
+        self._lines: list[str] = []
         self._ignore_depth = 0
 
+    # HTMLParser already lowercases tag names before these callbacks.
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-        if tag.lower() in {"script", "style"}:
+        if tag in IGNORED_TAGS:
             self._ignore_depth += 1
-        if tag.lower() in {"p", "li", "h1", "h2", "h3", "h4", "h5", "h6", "br", "tr"}:
-            self._parts.append("\n")
+        elif tag in BLOCK_TAGS:
+            self._flush()
 
     def handle_endtag(self, tag: str) -> None:
-        if tag.lower() in {"script", "style"} and self._ignore_depth > 0:
-            self._ignore_depth -= 1
-        if tag.lower() in {"p", "li", "h1", "h2", "h3", "h4", "h5", "h6", "br", "tr"}:
-            self._parts.append("\n")
+        if tag in IGNORED_TAGS:
+            if self._ignore_depth > 0:
+                self._ignore_depth -= 1
+        elif tag in BLOCK_TAGS:
+            self._flush()
 
     def handle_data(self, data: str) -> None:
-        if self._ignore_depth == 0:
-            self._parts.append(data)
-
-    def text(self) -> str:
-        return "".join(self._parts)
-
-
-@dataclass(frozen=True)
-class Constraint:
+        if self._ignore_depth > 0:
+            return
+        for piece in data.splitlines(keepends=True):
+            text = piece.splitlines()[0]
+            self._current.append(text)
+            if len(text) != len(piece):
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._current:
+            return
+        line = " ".join("".join(self._current).split())
+        self._current.clear()
+        if line:
+            self._lines.append(line)
+
+    def lines(self) -> list[str]:
+        self._flush()
+        return self._lines
+
+
+class Constraint(NamedTuple):
     component: str
     operator: str
     version: str
@@ -84,14 +116,29 @@ SOFTWARE_KEYWORDS = (
     "ubuntu",
 )
 
+WHITESPACE_RE = re.compile(r"\s+")
+
 CONSTRAINT_RE = re.compile(
     r"(?i)\b(jetpack|l4t|cuda|python|ubuntu|pytorch|tensorrt|onnx\s*runtime|onnxruntime)\b"
     r"(?:\s*(>=|<=|==|~=|>|<))?"
-    r"(?:\s*(?:version|v)?)?"
-    r"\s*([0-9]+(?:\.[0-9]+){0,2}|[0-9]+\.x)"
+    r"\s*(?:(?:version|v)\s*)?"
+    r"([0-9]+(?:\.[0-9]+){0,2}|[0-9]+\.x)"
 )
 
 
+def build_keyword_scanner(name: str, keywords: tuple[str, ...]) -> Callable[[str], bool]:
+    # Unrolls `any(k in line for k in keywords)` into a chain of `in` tests,
+    # which avoids the generator frame on the per-line hot path.
+    checks = " or ".join(f"{keyword!r} in line" for keyword in keywords)
+    namespace: dict[str, Any] = {}
+    exec(f"def {name}(line):\n    return {checks}\n", namespace)
+    return namespace[name]
+
+
+has_hardware_keyword = build_keyword_scanner("has_hardware_keyword", HARDWARE_KEYWORDS)
+has_software_keyword = build_keyword_scanner("has_software_keyword", SOFTWARE_KEYWORDS)
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Extract requirements from tutorial content.")
     parser.add_argument("--url", required=True, help="Tutorial URL or local path.")
@@ -131,19 +178,19 @@ def resolve_file_uri(parsed_path: str) -> Path:
     return Path(decoded)
 
 
-def load_source(url: str, timeout: int, allow_domains: list[str]) -> tuple[str, str, bool]:
+def load_source(url: str, timeout: int, allow_domains: list[str]) -> tuple[list[str], str]:
     source = url.strip()
     parsed = urlparse(source)
 
     if Path(source).exists():
         path = Path(source).resolve()
-        return path.read_text(encoding="utf-8", errors="replace"), path.as_uri(), path.suffix.lower() in {".html", ".htm"}
+        return read_file_lines(path), path.as_uri()
 
     if parsed.scheme == "file":
         path = resolve_file_uri(parsed.path).resolve()
         if not path.exists():
             raise FileNotFoundError(f"File not found: {path}")
-        return path.read_text(encoding="utf-8", errors="replace"), path.as_uri(), path.suffix.lower() in {".html", ".htm"}
+        return read_file_lines(path), path.as_uri()
 
     if parsed.scheme in {"http", "https"}:
         hostname = parsed.hostname or ""
@@ -151,73 +198,86 @@ def load_source(url: str, timeout: int, allow_domains: list[str]) -> tuple[str,
             raise ValueError(f"Domain not in allowlist: {hostname}")
         request = Request(source, headers={"User-Agent": "jetson-deployment-agent/1.0"})
         with urlopen(request, timeout=timeout) as response:
-            raw = response.read()
             content_type = response.headers.get("Content-Type", "")
-        text = raw.decode("utf-8", errors="replace")
-        is_html = "html" in content_type.lower() or "<html" in text.lower()
-        return text, source, is_html
+            chunks = iter_decoded_chunks(response)
+            head = next(chunks, "")
+            is_html = "html" in content_type.lower() or HTML_SNIFF_RE.search(head, 0, HTML_SNIFF_CHARS) is not None
+            chunks = chain([head], chunks)
+            if is_html:
+                return html_to_lines(chunks), source
+            return normalize_lines("".join(chunks)), source
 
     raise ValueError(f"Unsupported URL or path: {source}")
 
 
-def to_plain_text(content: str, is_html: bool) -> str:
-    if not is_html:
-        return content
+def read_file_lines(path: Path) -> list[str]:
+    text = path.read_text(encoding="utf-8", errors="replace")
+    if path.suffix.lower() in {".html", ".htm"}:
+        return html_to_lines([text])
+    return normalize_lines(text)
+
+
+def iter_decoded_chunks(response: BinaryIO) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        block = response.read(READ_CHUNK_SIZE)
+        if not block:
+            break
+        text = decoder.decode(block)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def html_to_lines(chunks: Iterable[str]) -> list[str]:
     parser = PlainTextHTMLParser()
-    parser.feed(content)
-    return parser.text()
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser.lines()
 
 
 def normalize_lines(text: str) -> list[str]:
     lines: list[str] = []
     for line in text.splitlines():
-        cleaned = re.sub(r"\s+", " ", line).strip()
+        cleaned = WHITESPACE_RE.sub(" ", line).strip()
         if cleaned:
             lines.append(cleaned)
     return lines
 
 
-def extract_hardware(lines: Iterable[str]) -> list[str]:
-    items: list[str] = []
-    seen: set[str] = set()
-    for line in lines:
-        lowered = line.lower()
-        if any(keyword in lowered for keyword in HARDWARE_KEYWORDS):
-            if line not in seen:
-                seen.add(line)
-                items.append(line)
-    return items
-
-
-def extract_software(lines: Iterable[str]) -> list[str]:
-    items: list[str] = []
-    seen: set[str] = set()
-    for line in lines:
-        lowered = line.lower()
-        if any(keyword in lowered for keyword in SOFTWARE_KEYWORDS):
-            if line not in seen:
-                seen.add(line)
-                items.append(line)
-    return items
-
-
+@lru_cache(maxsize=64)
 def canonical_component(raw_component: str) -> str:
-    normalized = re.sub(r"\s+", " ", raw_component.lower()).strip()
+    normalized = WHITESPACE_RE.sub(" ", raw_component.lower()).strip()
     return COMPONENT_ALIASES.get(normalized, normalized)
 
 
-def extract_constraints(lines: Iterable[str]) -> list[Constraint]:
+def extract_requirements(lines: Iterable[str]) -> tuple[list[str], list[str], list[Constraint]]:
+    hardware: dict[str, None] = {}
+    software: dict[str, None] = {}
     constraints: list[Constraint] = []
-    seen: set[tuple[str, str, str, str]] = set()
+    seen_lines: set[str] = set()
     for line in lines:
+        # A repeated line cannot add new requirements or constraint evidence.
+        if line in seen_lines:
+            continue
+        seen_lines.add(line)
+        lowered = line.lower()
+        if has_hardware_keyword(lowered):
+            hardware[line] = None
+        if has_software_keyword(lowered):
+            software[line] = None
+        line_seen: set[tuple[str, str, str]] = set()
         for match in CONSTRAINT_RE.finditer(line):
             component = canonical_component(match.group(1))
             operator = match.group(2) or "=="
             version = match.group(3)
-            key = (component, operator, version, line)
-            if key in seen:
+            key = (component, operator, version)
+            if key in line_seen:
                 continue
-            seen.add(key)
+            line_seen.add(key)
             constraints.append(
                 Constraint(
                     component=component,
@@ -226,8 +286,19 @@ def extract_constraints(lines: Iterable[str]) -> list[Constraint]:
                     evidence=line,
                 )
             )
-    constraints.sort(key=lambda c: (c.component, c.version, c.operator, c.evidence))
-    return constraints
+    constraints.sort(key=attrgetter("component", "version", "operator", "evidence"))
+    return list(hardware), list(software), constraints
+
+
+def write_json(path: Path, payload: dict[str, Any]) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2) + b"\n")
+    else:
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+            handle.write("\n")
+    os.replace(tmp_path, path)
 
 
 def compute_confidence(
@@ -247,16 +318,12 @@ def main() -> int:
     allow_domains = normalize_domain_list(args.allow_domains)
 
     try:
-        content, source_url, is_html = load_source(args.url, args.timeout, allow_domains)
+        lines, source_url = load_source(args.url, args.timeout, allow_domains)
     except Exception as exc:
         print(f"[extract-tutorial-requirements][ERROR] {exc}", file=sys.stderr)
         return 1
 
-    text = to_plain_text(content, is_html)
-    lines = normalize_lines(text)
-    hardware = extract_hardware(lines)
-    software = extract_software(lines)
-    constraints = extract_constraints(lines)
+    hardware, software, constraints = extract_requirements(lines)
 
     notes: list[str] = []
     if not constraints:
@@ -289,7 +356,7 @@ def main() -> int:
 
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    write_json(output_path, payload)
     return 0
 
 